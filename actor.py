@@ -48,20 +48,33 @@ def initialize_actor(id):
 
     return config
 
-def load_policy(policy):
+def get_policy_mtime(policy_name):
+    # cover every file policy.load reads, the model-based algorithms also load "_model"
+    suffixes = ["actor", "noise"]
+    if exists(join(BUFFER_PATH, "%s_model" %(policy_name))):
+        suffixes.append("model")
+    return tuple(os.path.getmtime(join(BUFFER_PATH, "%s_%s" %(policy_name, s))) for s in suffixes)
+
+def load_policy(policy, last_mtime=None):
+    """Load the latest policy from the buffer, skipping the load if the
+    saved files have not changed since last_mtime
+    """
     f = True
     policy_name = "policy"
+    mtime = last_mtime
     while f:
         try:
             if not os.path.exists(join(BUFFER_PATH, "%s_copy_actor" %(policy_name))):
-                policy.load(BUFFER_PATH, policy_name)
+                mtime = get_policy_mtime(policy_name)
+                if mtime != last_mtime:
+                    policy.load(BUFFER_PATH, policy_name)
             f = False
         except FileNotFoundError:
             time.sleep(1)
         except:
             logging.exception('')
             time.sleep(1)
-    return policy
+    return policy, mtime
 
 def write_buffer(traj, id):
     file_names = os.listdir(join(BUFFER_PATH, 'actor_%s' %(str(id))))
@@ -72,9 +85,10 @@ def write_buffer(traj, id):
         sorted(eps)
         ep = eps[-1] + 1
     if len(file_names) < 10:
-        with open(join(BUFFER_PATH, 'actor_%s' %(str(id)), 'traj_%d.pickle' %(ep)), 'wb') as f:
+        with open(join(BUFFER_PATH, 'actor_%s' %(str(id)), 'traj_%d.pickle' %(ep)), 'wb', buffering=1 << 20) as f:
             try:
-                pickle.dump(traj, f)
+                # protocol 4 keeps the file readable by the Python 3.6 in the ros:melodic image
+                pickle.dump(traj, f, protocol=4)
             except OSError as e:
                 logging.exception('Failed to dump the trajectory! %s', e)
                 pass
@@ -109,12 +123,13 @@ def main(args):
 
     policy, _ = initialize_policy(config, env, init_buffer=False, device="cpu")
     num_ep = 0
+    policy_mtime = None
 
     for _ in range(args.num_trajs):
         obs = env.reset()
         traj = []
         done = False
-        policy = load_policy(policy)
+        policy, policy_mtime = load_policy(policy, policy_mtime)
         while not done:
             actions = policy.select_action(obs)
             obs_new, rew, done, info = env.step(actions)
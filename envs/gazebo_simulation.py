@@ -1,4 +1,4 @@
-import numpy as np
+import math
 
 try:  # make sure to create a fake environment without ros installed
     import rospy
@@ -18,7 +18,7 @@ def create_model_state(x, y, z, angle):
     model_state.pose.position.x = x
     model_state.pose.position.y = y
     model_state.pose.position.z = z
-    model_state.pose.orientation = Quaternion(0, 0, np.sin(angle/2.), np.cos(angle/2.))
+    model_state.pose.orientation = Quaternion(0, 0, math.sin(angle/2.), math.cos(angle/2.))
     model_state.reference_frame = "world"
 
     return model_state
@@ -31,6 +31,8 @@ class GazeboSimulation():
         self._unpause = rospy.ServiceProxy('/gazebo/unpause_physics', Empty)
         self._reset = rospy.ServiceProxy('/gazebo/set_model_state', SetModelState)
         self._model_state_getter = rospy.ServiceProxy('/gazebo/get_model_state', GetModelState)
+        for service in ['/gazebo/pause_physics', '/gazebo/unpause_physics', '/gazebo/set_model_state', '/gazebo/get_model_state']:
+            rospy.wait_for_service(service)
 
         self._init_model_state = create_model_state(init_position[0],init_position[1],0,init_position[2])
         
@@ -72,14 +74,12 @@ class GazeboSimulation():
         return collided
 
     def pause(self):
-        rospy.wait_for_service('/gazebo/pause_physics')
         try:
             self._pause()
         except rospy.ServiceException:
             print ("/gazebo/pause_physics service call failed")
 
     def unpause(self):
-        rospy.wait_for_service('/gazebo/unpause_physics')
         try:
             self._unpause()
         except rospy.ServiceException:
@@ -91,7 +91,6 @@ class GazeboSimulation():
         destroy the world setting, here we used set model state
         to put the model back to the origin
         """
-        rospy.wait_for_service("/gazebo/set_model_state")
         try:
             self._reset(self._init_model_state)
         except (rospy.ServiceException):
@@ -107,7 +106,6 @@ class GazeboSimulation():
         return data
 
     def get_model_state(self):
-        rospy.wait_for_service("/gazebo/get_model_state")
         try:
             return self._model_state_getter('jackal', 'world')
         except (rospy.ServiceException):
@@ -1,4 +1,5 @@
 import gym
+import math
 import time
 import numpy as np
 import os
@@ -13,6 +14,7 @@ except ModuleNotFoundError:
     pass
 
 from envs.gazebo_simulation import GazeboSimulation
+from envs.move_base import transform_lg
 
 
 class JackalGazebo(gym.Env):
@@ -113,7 +115,8 @@ class JackalGazebo(gym.Env):
         flip = pos.z > 0.1  # robot flip
         
         goal_pos = np.array([self.world_frame_goal[0] - pos.x, self.world_frame_goal[1] - pos.y])
-        success = np.linalg.norm(goal_pos) < 0.4
+        goal_dist = math.hypot(goal_pos[0], goal_pos[1])
+        success = goal_dist < 0.4
         
         timeout = self.step_count >= self.max_step
         
@@ -131,7 +134,7 @@ class JackalGazebo(gym.Env):
         if collided:
             rew += self.collision_reward
 
-        rew += (np.linalg.norm(self.last_goal_pos) - np.linalg.norm(goal_pos)) * self.goal_reward
+        rew += (math.hypot(self.last_goal_pos[0], self.last_goal_pos[1]) - goal_dist) * self.goal_reward
         self.last_goal_pos = goal_pos
         
         info = dict(
@@ -151,11 +154,12 @@ class JackalGazebo(gym.Env):
         return obs, rew, done, info
 
     def _take_action(self, action):
-        current_time = rospy.get_time()
-        while current_time - self.current_time < self.time_step:
-            time.sleep(0.01)
-            current_time = rospy.get_time()
-        self.current_time = current_time
+        # sleep on the ROS (simulation) clock, which wakes up on each /clock
+        # update instead of polling it every 10 ms of wall time
+        remaining = self.time_step - (rospy.get_time() - self.current_time)
+        if remaining > 0:
+            rospy.sleep(remaining)
+        self.current_time = rospy.get_time()
 
     def _get_observation(self, pos, psi):
         raise NotImplementedError()
@@ -193,6 +197,9 @@ class JackalGazeboLaser(JackalGazebo):
             shape=(obs_dim,),
             dtype=np.float32
         )
+        # reused every step to avoid per-step allocation
+        self._laser_buf = np.empty(720, dtype=np.float32)
+        self._obs_buf = np.empty(obs_dim, dtype=np.float32)
 
     def _get_laser_scan(self):
         """Get 720 dim laser scan
@@ -200,35 +207,29 @@ class JackalGazeboLaser(JackalGazebo):
             np.ndarray: (720,) array of laser scan 
         """
         laser_scan = self.gazebo_sim.get_laser_scan()
-        laser_scan = np.array(laser_scan.ranges)
-        laser_scan[laser_scan > self.laser_clip] = self.laser_clip
-        return laser_scan
+        ranges = np.fromiter(laser_scan.ranges, dtype=np.float32, count=len(laser_scan.ranges))
+        np.clip(ranges, 0, self.laser_clip, out=self._laser_buf)
+        return self._laser_buf
 
     def _get_observation(self, pos, psi, action):
         # observation is the 720 dim laser scan + one local goal in angle
         laser_scan = self._get_laser_scan()
-        laser_scan = (laser_scan - self.laser_clip/2.) / self.laser_clip * 2 # scale to (-1, 1)
+        obs = self._obs_buf
+        obs[:720] = (laser_scan - self.laser_clip/2.) / self.laser_clip * 2 # scale to (-1, 1)
         
         goal_pos = self.transform_goal(self.world_frame_goal, pos, psi) / 5.0 - 1  # roughly (-1, 1) range
+        obs[720:722] = goal_pos
         
         bias = (self.action_space.high + self.action_space.low) / 2.
         scale = (self.action_space.high - self.action_space.low) / 2.
-        action = (action - bias) / scale
-        
-        obs = [laser_scan, goal_pos, action]
-        
-        obs = np.concatenate(obs)
+        obs[722:] = (action - bias) / scale
 
-        return obs
+        # the frames are kept by StackFrame, so hand out a copy of the buffer
+        return obs.copy()
     
     def transform_goal(self, goal_pos, pos, psi):
         """ transform goal in the robot frame
         params:
             pos_1
         """
-        R_r2i = np.matrix([[np.cos(psi), -np.sin(psi), pos.x], [np.sin(psi), np.cos(psi), pos.y], [0, 0, 1]])
-        R_i2r = np.linalg.inv(R_r2i)
-        pi = np.matrix([[goal_pos[0]], [goal_pos[1]], [1]])
-        pr = np.matmul(R_i2r, pi)
-        lg = np.array([pr[0,0], pr[1, 0]])
-        return lg
+        return transform_lg(goal_pos, pos.x, pos.y, psi)
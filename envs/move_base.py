@@ -1,3 +1,4 @@
+import math
 import numpy as np
 import scipy.signal
 
@@ -24,7 +25,7 @@ def _create_MoveBaseGoal(x, y, angle):
     mb_goal.target_pose.pose.position.y = y
     mb_goal.target_pose.pose.position.z = 0 # z must be 0.0 (no height in the map)
 
-    mb_goal.target_pose.pose.orientation = Quaternion(0, 0, np.sin(angle/2.), np.cos(angle/2.))
+    mb_goal.target_pose.pose.orientation = Quaternion(0, 0, math.sin(angle/2.), math.cos(angle/2.))
 
     return mb_goal
 
@@ -74,39 +75,26 @@ class Robot_config():
         self.qt = (q1, q2, q3, q0)
 
     def get_global_path(self, msg):
-        gp = []
-        for pose in msg.poses:
-            gp.append([pose.pose.position.x, pose.pose.position.y])
-        gp = np.array(gp)
-        x = gp[:,0]
-        try:
-            xhat = scipy.signal.savgol_filter(x, 19, 3)
-        except:
-            xhat = x
-        y = gp[:,1]
-        try:
-            yhat = scipy.signal.savgol_filter(y, 19, 3)
-        except:
-            yhat = y
-        gphat = np.column_stack((xhat, yhat))
-        gphat.tolist()
+        gp = np.array([[p.pose.position.x, p.pose.position.y] for p in msg.poses], dtype=np.float64).reshape(-1, 2)
+        if len(gp) >= 19:  # savgol window length
+            gphat = scipy.signal.savgol_filter(gp, 19, 3, axis=0)
+        else:
+            gphat = gp
         self.global_path = gphat
 
 def transform_lg(wp, X, Y, PSI):
-    R_r2i = np.matrix([[np.cos(PSI), -np.sin(PSI), X], [np.sin(PSI), np.cos(PSI), Y], [0, 0, 1]])
-    R_i2r = np.linalg.inv(R_r2i)
-    pi = np.matrix([[wp[0]], [wp[1]], [1]])
-    pr = np.matmul(R_i2r, pi)
-    lg = np.array([pr[0,0], pr[1, 0]])
-    return lg
+    # closed-form inverse of the robot-to-inertia transform
+    c, s = np.cos(PSI), np.sin(PSI)
+    dx = wp[0] - X
+    dy = wp[1] - Y
+    return np.array([c*dx + s*dy, -s*dx + c*dy])
 
 def transform_gp(gp, X, Y, PSI):
-    R_r2i = np.matrix([[np.cos(PSI), -np.sin(PSI), X], [np.sin(PSI), np.cos(PSI), Y], [0, 0, 1]])
-    R_i2r = np.linalg.inv(R_r2i)
-
-    pi = np.concatenate([gp, np.ones_like(gp[:, :1])], axis=-1)
-    pr = np.matmul(R_i2r, pi.T)
-    return np.asarray(pr[:2, :])
+    gp = np.asarray(gp)
+    c, s = np.cos(PSI), np.sin(PSI)
+    dx = gp[:, 0] - X
+    dy = gp[:, 1] - Y
+    return np.stack([c*dx + s*dy, -s*dx + c*dy])
 
 
 class MoveBase():
@@ -121,11 +109,16 @@ class MoveBase():
         self.global_goal = _create_MoveBaseGoal(goal_position[0], goal_position[1], goal_position[2])
         self._reset_odom = rospy.ServiceProxy('/set_pose', SetPose)
         self._clear_costmap = rospy.ServiceProxy('/move_base/clear_costmaps', Empty)
+        # the servers must be up before the first reset or goal is sent
+        self.nav_as.wait_for_server()
+        rospy.wait_for_service('/set_pose')
+        rospy.wait_for_service('/move_base/clear_costmaps')
 
         self.robot_config = Robot_config()
-        self.sub_robot = rospy.Subscriber("/odometry/filtered", Odometry, self.robot_config.get_robot_status)
+        # queue_size=1 with a large buff_size so the callbacks only decode the latest message
+        self.sub_robot = rospy.Subscriber("/odometry/filtered", Odometry, self.robot_config.get_robot_status, queue_size=1, buff_size=2**24)
         # self.sub_gp = rospy.Subscriber("/move_base/" + self.base_local_planner + "/global_plan", Path, self.robot_config.get_global_path)
-        self.sub_gp = rospy.Subscriber("/move_base/NavfnROS/plan", Path, self.robot_config.get_global_path)
+        self.sub_gp = rospy.Subscriber("/move_base/NavfnROS/plan", Path, self.robot_config.get_global_path, queue_size=1, buff_size=2**25)
 
     def set_navi_param(self, param_name, param):
 
@@ -150,14 +143,12 @@ class MoveBase():
         return param
 
     def set_global_goal(self):
-        self.nav_as.wait_for_server()
         try:
             self.nav_as.send_goal(self.global_goal)
         except (rospy.ServiceException) as e:
             print ("/move_base service call failed")
 
     def reset_robot_in_odom(self):
-        rospy.wait_for_service('/set_pose')
         try:
             self._reset_odom(_create_PoseWithCovarianceStamped())
         except rospy.ServiceException:
@@ -170,7 +161,6 @@ class MoveBase():
         self.robot_config.vel_counter = 0
 
     def clear_costmap(self):
-        rospy.wait_for_service('/move_base/clear_costmaps')
         try:
             self._clear_costmap()
         except rospy.ServiceException:
@@ -197,23 +187,16 @@ class MoveBase():
         lg_x = 0
         lg_y = 0
         if len(gp)>0:
-            lg_flag = 0
-            for wp in gp:
-                dist = (np.array(wp)-np.array([X, Y]))**2
-                dist = np.sum(dist, axis=0)
-                dist = np.sqrt(dist)
-                if dist > los:
-                    lg_flag = 1
-                    self.robot_config.last_lg = wp
-                    lg = transform_lg(wp, X, Y, PSI)
-                    lg_x = lg[0]
-                    lg_y = lg[1]
-                    break
-            if lg_flag == 0:
-                self.robot_config.last_lg = gp[-1]
-                lg = transform_lg(gp[-1], X, Y, PSI)
-                lg_x = lg[0]
-                lg_y = lg[1]
+            gp = np.asarray(gp)
+            diffs = gp - np.array([X, Y])
+            dists = np.einsum('ij,ij->i', diffs, diffs)  # squared distance, compared against los**2
+            mask = dists > los * los
+            # first waypoint out of line of sight, otherwise the end of the path
+            wp = gp[mask.argmax()] if mask.any() else gp[-1]
+            self.robot_config.last_lg = wp
+            lg = transform_lg(wp, X, Y, PSI)
+            lg_x = lg[0]
+            lg_y = lg[1]
 
         local_goal = Pose()
         local_goal.position.x = lg_x
@@ -44,7 +44,7 @@ class DDPG(BaseRLAlgo):
         self.total_it = 0
 
     def select_action(self, state, to_cpu=True):
-        state = torch.FloatTensor(state).to(self.device)
+        state = torch.as_tensor(state, dtype=torch.float32, device=self.device)
         if len(state.shape) < 3:
             state = state[None, :, :]
         action = self.actor(state)
@@ -324,7 +324,7 @@ class SMCPRLAlgo(BaseRLAlgo):
     def select_action(self, state):
         if self.exploration_noise >= 0:
             assert len(state.shape) == 2, "does not support batched action selection!"
-            state = torch.FloatTensor(state).to(self.device)[None, ...]  # (batch_size=1, history_length, 723)
+            state = torch.as_tensor(state, dtype=torch.float32, device=self.device)[None, ...]  # (batch_size=1, history_length, 723)
             s = state.repeat(self.num_particle, 1, 1).clone()
             r = 0
             gamma = torch.zeros((self.num_particle, 1)).to(self.device)
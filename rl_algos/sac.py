@@ -132,7 +132,7 @@ class SAC(BaseRLAlgo):
             self.alpha_optim = torch.optim.Adam([self.log_alpha], lr=0.0001)
 
     def select_action(self, state, to_cpu=True):
-        state = torch.FloatTensor(state).to(self.device)
+        state = torch.as_tensor(state, dtype=torch.float32, device=self.device)
         if len(state.shape) < 3:
             state = state[None, :, :]
         action, *_ = self.actor.sample(state)